@@ -3,7 +3,8 @@ Travel Guide - AI-Powered Trip Planner
 A comprehensive travel planning application with weather forecasts, value scores, and PDF generation.
 
 Installation:
-pip install streamlit reportlab pillow requests
+pip install streamlit reportlab pillow requests numpy
+pip install orjson  # optional, faster itinerary serialization
 
 Run:
 streamlit run travel_guide.py
@@ -13,20 +14,22 @@ import streamlit as st
 import datetime
 from datetime import timedelta
 import random
+import zlib
+import json
+import importlib.util
 from io import BytesIO
+from collections import namedtuple
 import traceback
+import numpy as np
 
-# PDF imports with error handling
 try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER
-    PDF_AVAILABLE = True
-except ImportError as e:
-    PDF_AVAILABLE = False
+    import orjson
+except ImportError:
+    orjson = None
+
+# PDF support is optional; reportlab itself is only imported when a guide is built
+PDF_AVAILABLE = importlib.util.find_spec('reportlab') is not None
+if not PDF_AVAILABLE:
     st.error(f"⚠️ PDF generation not available. Install reportlab: pip install reportlab")
 
 # Page configuration
@@ -37,7 +40,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -51,12 +54,10 @@ st.markdown("""
         color: #6B7280;
         margin-bottom: 2rem;
     }
-    .activity-card {
-        background-color: #F9FAFB;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #4F46E5;
-        margin-bottom: 1rem;
+    .weather-grid {
+        display: grid;
+        grid-template-columns: repeat(7, 1fr);
+        gap: 1rem;
     }
     .weather-box {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -76,17 +77,26 @@ st.markdown("""
         width: 100%;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if 'itinerary' not in st.session_state:
-    st.session_state.itinerary = None
+if 'itinerary_blob' not in st.session_state:
+    st.session_state.itinerary_blob = None
+if 'itinerary_totals' not in st.session_state:
+    st.session_state.itinerary_totals = None
 if 'weather_data' not in st.session_state:
     st.session_state.weather_data = None
+if 'weather_array' not in st.session_state:
+    st.session_state.weather_array = None
 if 'value_score' not in st.session_state:
     st.session_state.value_score = None
 if 'pdf_error' not in st.session_state:
     st.session_state.pdf_error = None
+if 'pdf_bytes' not in st.session_state:
+    st.session_state.pdf_bytes = None
+if 'pdf_inputs' not in st.session_state:
+    st.session_state.pdf_inputs = None
 if 'form_key' not in st.session_state:
     st.session_state.form_key = 0
 
@@ -150,33 +160,86 @@ GUARDRAILS = {
     ]
 }
 
-def generate_weather_forecast(days=14):
-    """Generate mock weather data"""
-    weather_conditions = ['sunny', 'partly_cloudy', 'cloudy', 'rainy']
-    forecast = []
+# Per-meal cost by budget level
+LUNCH_COSTS = {'budget': 15, 'moderate': 25, 'luxury': 45, 'ultra': 45}
+DINNER_COSTS = {'budget': 20, 'moderate': 35, 'luxury': 65, 'ultra': 65}
+
+# Activity templates based on interests
+Activity = namedtuple('Activity', 'title desc cost type')
+
+MORNING_ACTIVITIES = {
+    'museums': Activity('Local Art Museum', 'Explore contemporary and classical art collections', 15, 'culture'),
+    'nature': Activity('National Park Exploration', 'Scenic trails and wildlife viewing', 0, 'nature'),
+    'historic': Activity('Historical Walking Tour', 'Discover ancient architecture and stories', 10, 'historic'),
+    'food': Activity('Food Market Tour', 'Sample local delicacies and fresh produce', 20, 'food'),
+    'wellness': Activity('Morning Yoga Session', 'Beach-side meditation and stretching', 25, 'wellness')
+}
+
+AFTERNOON_ACTIVITIES = {
+    'shopping': Activity('Artisan Market Visit', 'Local crafts and unique souvenirs', 0, 'shopping'),
+    'beach': Activity('Beach Time & Water Sports', 'Relax or try snorkeling/surfing', 30, 'beach'),
+    'culture': Activity('Cultural Center Tour', 'Traditional performances and exhibits', 12, 'culture'),
+    'adventure': Activity('Adventure Activity', 'Zip-lining or rock climbing experience', 50, 'adventure'),
+    'photography': Activity('Photo Walk Tour', 'Capture stunning vistas and street scenes', 15, 'photography')
+}
+
+EVENING_ACTIVITIES = {
+    'nightlife': Activity('Rooftop Bar Experience', 'Panoramic views with cocktails', 40, 'nightlife'),
+    'food': Activity('Fine Dining Experience', 'Local specialties in authentic setting', 60, 'food'),
+    'culture': Activity('Traditional Show', 'Music and dance performance', 25, 'culture')
+}
+
+# Full template lists, used as-is when no interests are selected
+MORNING_TEMPLATES = tuple(MORNING_ACTIVITIES.values())
+AFTERNOON_TEMPLATES = tuple(AFTERNOON_ACTIVITIES.values())
+EVENING_KEYS = tuple(EVENING_ACTIVITIES)
+
+# Weather conditions, indexed by the forecast's condition codes
+WEATHER_CONDITIONS = ('sunny', 'partly_cloudy', 'cloudy', 'rainy')
+RAINY = WEATHER_CONDITIONS.index('rainy')
+WEATHER_ICONS = {'sunny': '☀️', 'partly_cloudy': '⛅', 'cloudy': '☁️', 'rainy': '🌧️'}
+WEATHER_DTYPE = np.dtype([('temp', np.int8), ('cond', np.int8), ('precip', np.int8), ('uv', np.int8)])
+
+def trip_seed(destination, start_date):
+    """Derive a stable random seed for a destination and start date"""
+    return zlib.crc32(f"{destination}|{start_date}".encode('utf-8'))
+
+@st.cache_data(ttl=600, max_entries=64)
+def generate_weather_forecast(days=14, seed=None):
+    """Generate mock weather as (day dicts, WEATHER_DTYPE record array), cached per days/seed"""
+    rng = np.random.default_rng(seed)
     
-    for i in range(days):
-        temp = random.randint(65, 85)
-        condition = random.choice(weather_conditions)
-        precipitation = random.randint(0, 30) if condition == 'rainy' else random.randint(0, 10)
-        
-        forecast.append({
+    # Draw every day at once instead of calling random per day
+    temps = rng.integers(65, 86, days)
+    cond_idx = rng.integers(0, len(WEATHER_CONDITIONS), days)
+    precip = np.where(cond_idx == RAINY, rng.integers(0, 31, days), rng.integers(0, 11, days))
+    uv = rng.integers(3, 11, days)
+    
+    forecast = [
+        {
             'day': i + 1,
             'temp': temp,
-            'condition': condition,
+            'condition': WEATHER_CONDITIONS[cond],
             'precipitation': precipitation,
-            'uv_index': random.randint(3, 10)
-        })
+            'uv_index': uv_index
+        }
+        for i, (temp, cond, precipitation, uv_index) in enumerate(
+            zip(temps.tolist(), cond_idx.tolist(), precip.tolist(), uv.tolist())
+        )
+    ]
+    forecast_array = np.rec.fromarrays([temps, cond_idx, precip, uv], dtype=WEATHER_DTYPE)
     
-    return forecast
+    return forecast, forecast_array
 
-def calculate_value_score(destination, budget):
-    """Calculate value score for destination"""
+@st.cache_data(ttl=600, max_entries=64)
+def calculate_value_score(destination, budget, seed=None):
+    """Calculate value score for destination (cached per destination/budget/seed)"""
+    uniform = random.Random(seed).uniform
     return {
-        'overall': round(random.uniform(7.0, 9.5), 1),
-        'cost_of_living': round(random.uniform(6.5, 9.0), 1),
-        'exchange_rate': round(random.uniform(7.0, 9.5), 1),
-        'value_rating': round(random.uniform(7.5, 9.5), 1),
+        'overall': round(uniform(7.0, 9.5), 1),
+        'cost_of_living': round(uniform(6.5, 9.0), 1),
+        'exchange_rate': round(uniform(7.0, 9.5), 1),
+        'value_rating': round(uniform(7.5, 9.5), 1),
         'avg_daily_cost': {
             'budget': 75,
             'moderate': 150,
@@ -185,296 +248,370 @@ def calculate_value_score(destination, budget):
         }.get(budget, 150)
     }
 
-def generate_itinerary(destination, days, interests, guardrails, budget):
-    """Generate complete trip itinerary"""
-    itinerary_days = []
-    
-    # Activity templates based on interests
-    morning_activities = {
-        'museums': ('Local Art Museum', 'Explore contemporary and classical art collections', 15, 'culture'),
-        'nature': ('National Park Exploration', 'Scenic trails and wildlife viewing', 0, 'nature'),
-        'historic': ('Historical Walking Tour', 'Discover ancient architecture and stories', 10, 'historic'),
-        'food': ('Food Market Tour', 'Sample local delicacies and fresh produce', 20, 'food'),
-        'wellness': ('Morning Yoga Session', 'Beach-side meditation and stretching', 25, 'wellness')
-    }
-    
-    afternoon_activities = {
-        'shopping': ('Artisan Market Visit', 'Local crafts and unique souvenirs', 0, 'shopping'),
-        'beach': ('Beach Time & Water Sports', 'Relax or try snorkeling/surfing', 30, 'beach'),
-        'culture': ('Cultural Center Tour', 'Traditional performances and exhibits', 12, 'culture'),
-        'adventure': ('Adventure Activity', 'Zip-lining or rock climbing experience', 50, 'adventure'),
-        'photography': ('Photo Walk Tour', 'Capture stunning vistas and street scenes', 15, 'photography')
-    }
-    
-    evening_activities = {
-        'nightlife': ('Rooftop Bar Experience', 'Panoramic views with cocktails', 40, 'nightlife'),
-        'food': ('Fine Dining Experience', 'Local specialties in authentic setting', 60, 'food'),
-        'culture': ('Traditional Show', 'Music and dance performance', 25, 'culture')
-    }
+def generate_itinerary(destination, days, interests, guardrails, budget, seed=None):
+    """Generate a column-wise trip itinerary and its totals as (itinerary, totals)"""
+    trip_cost = 0
+    trip_activities = 0
+    total_costs = []
+    activity_counts = []
+    all_activities = []
+    # Separate stream from the weather forecast, which uses the same trip seed
+    rng = np.random.default_rng(None if seed is None else [seed, 1])
+    interests = frozenset(interests)
+    guardrails = frozenset(guardrails)
     
     free_only = 'free_activities_only' in guardrails
     kids_friendly = 'kids_friendly' in guardrails
     no_walking = 'no_walking_tours' in guardrails
+    veg_required = 'vegetarian_required' in guardrails
+    nightlife_evening = not kids_friendly and 'nightlife' in interests
+    
+    # Meal costs only depend on the budget
+    lunch_cost = 15 if free_only else LUNCH_COSTS.get(budget, 45)
+    dinner_cost = 20 if free_only else DINNER_COSTS.get(budget, 65)
+    
+    # Matching templates don't change from day to day, so filter them once
+    if interests:
+        morning_pool = tuple(v for k, v in MORNING_ACTIVITIES.items() if k in interests)
+        afternoon_pool = tuple(v for k, v in AFTERNOON_ACTIVITIES.items() if k in interests)
+        evening_keys = tuple(k for k in EVENING_ACTIVITIES if k in interests)
+    else:
+        morning_pool = MORNING_TEMPLATES
+        afternoon_pool = AFTERNOON_TEMPLATES
+        evening_keys = EVENING_KEYS
+    
+    # Draw the template index for every day up front
+    morning_idx = rng.integers(0, len(morning_pool), days).tolist() if morning_pool else None
+    afternoon_idx = rng.integers(0, len(afternoon_pool), days).tolist() if afternoon_pool else None
+    evening_idx = rng.integers(0, len(evening_keys), days).tolist() if evening_keys else None
+    
+    # Day themes and walking distances for the whole trip
+    themes = [f'Day {day_num} Exploration' for day_num in range(1, days + 1)]
+    themes[-1] = 'Farewell & Departure'
+    themes[0] = 'Arrival & Orientation'
+    if no_walking:
+        walking_distances = ['0.5 km'] * days
+    else:
+        walking_distances = [f'{km} km' for km in rng.integers(3, 9, days).tolist()]
     
     for day_num in range(1, days + 1):
-        activities = []
-        
         # Morning activity
-        morning_choices = [k for k in morning_activities.keys() if k in interests or not interests]
-        if morning_choices:
-            choice = random.choice(morning_choices)
-            title, desc, cost, activity_type = morning_activities[choice]
+        morning = None
+        m_cost = 0
+        if morning_pool:
+            title, desc, m_cost, activity_type = morning_pool[morning_idx[day_num - 1]]
             if free_only:
-                cost = 0
+                m_cost = 0
             if no_walking and 'walking' in title.lower():
                 title = title.replace('Walking', 'Bus')
             
-            activities.append({
+            morning = {
                 'time': '9:00 AM - 11:30 AM',
                 'title': title,
                 'description': desc,
-                'cost': cost,
+                'cost': m_cost,
                 'type': activity_type,
                 'energy': 'medium'
-            })
+            }
         
         # Lunch
-        lunch_cost = 15 if budget == 'budget' else 25 if budget == 'moderate' else 45
-        if free_only:
-            lunch_cost = 15
-        
-        activities.append({
+        lunch = {
             'time': '12:00 PM - 1:30 PM',
-            'title': 'Vegetarian Café' if 'vegetarian_required' in guardrails else 'Local Cuisine Restaurant',
+            'title': 'Vegetarian Café' if veg_required else 'Local Cuisine Restaurant',
             'description': 'Authentic local flavors and regional specialties',
             'cost': lunch_cost,
             'type': 'food',
             'energy': 'low'
-        })
+        }
         
         # Afternoon activity
-        afternoon_choices = [k for k in afternoon_activities.keys() if k in interests or not interests]
-        if afternoon_choices:
-            choice = random.choice(afternoon_choices)
-            title, desc, cost, activity_type = afternoon_activities[choice]
+        afternoon = None
+        a_cost = 0
+        if afternoon_pool:
+            title, desc, a_cost, activity_type = afternoon_pool[afternoon_idx[day_num - 1]]
             if free_only:
-                cost = 0
+                a_cost = 0
             
-            activities.append({
+            afternoon = {
                 'time': '2:00 PM - 5:00 PM',
                 'title': title,
                 'description': desc,
-                'cost': cost,
+                'cost': a_cost,
                 'type': activity_type,
                 'energy': 'medium'
-            })
+            }
         
         # Dinner
-        dinner_cost = 20 if budget == 'budget' else 35 if budget == 'moderate' else 65
-        if free_only:
-            dinner_cost = 20
-        
-        activities.append({
+        dinner = {
             'time': '6:30 PM - 8:00 PM',
             'title': 'Dinner at Local Restaurant',
             'description': 'Traditional dishes in cozy atmosphere',
             'cost': dinner_cost,
             'type': 'food',
             'energy': 'low'
-        })
+        }
         
         # Evening activity
-        if not kids_friendly and 'nightlife' in interests:
+        if nightlife_evening:
             choice = 'nightlife'
         else:
-            evening_choices = [k for k in evening_activities.keys() if k in interests or not interests]
-            choice = random.choice(evening_choices) if evening_choices else 'culture'
+            choice = evening_keys[evening_idx[day_num - 1]] if evening_keys else 'culture'
         
-        if choice in evening_activities:
-            title, desc, cost, activity_type = evening_activities[choice]
+        evening = None
+        e_cost = 0
+        if choice in EVENING_ACTIVITIES:
+            title, desc, e_cost, activity_type = EVENING_ACTIVITIES[choice]
             if free_only or kids_friendly:
                 title = 'Evening Stroll'
                 desc = 'Family-friendly walk along waterfront'
-                cost = 0
+                e_cost = 0
                 activity_type = 'nature'
             
-            activities.append({
+            evening = {
                 'time': '8:30 PM - 10:00 PM',
                 'title': title,
                 'description': desc,
-                'cost': cost,
+                'cost': e_cost,
                 'type': activity_type,
                 'energy': 'low'
-            })
+            }
         
-        total_cost = sum(a['cost'] for a in activities)
-        walking_dist = '0.5 km' if no_walking else f'{random.randint(3, 8)} km'
+        activities = [a for a in (morning, lunch, afternoon, dinner, evening) if a is not None]
+        total_cost = m_cost + lunch_cost + a_cost + dinner_cost + e_cost
         
-        theme = 'Arrival & Orientation' if day_num == 1 else \
-                'Farewell & Departure' if day_num == days else \
-                f'Day {day_num} Exploration'
-        
-        itinerary_days.append({
+        total_costs.append(total_cost)
+        activity_counts.append(len(activities))
+        all_activities.extend(activities)
+        trip_cost += total_cost
+        trip_activities += len(activities)
+    
+    itinerary = {
+        'themes': themes,
+        'walking_distances': walking_distances,
+        'total_costs': total_costs,
+        'activity_counts': activity_counts,
+        'activities': all_activities
+    }
+    totals = {'total_cost': trip_cost, 'total_activities': trip_activities}
+    return itinerary, totals
+
+def iter_itinerary_days(itinerary):
+    """Yield each itinerary day as a dict of day, theme, activities, total_cost and walking_distance"""
+    start = 0
+    for day_num, (theme, walking_dist, total_cost, count) in enumerate(zip(
+        itinerary['themes'], itinerary['walking_distances'],
+        itinerary['total_costs'], itinerary['activity_counts']
+    ), start=1):
+        yield {
             'day': day_num,
             'theme': theme,
-            'activities': activities,
+            'activities': itinerary['activities'][start:start + count],
             'total_cost': total_cost,
             'walking_distance': walking_dist
-        })
+        }
+        start += count
+
+def encode_itinerary(itinerary):
+    """Serialize an itinerary to a compact JSON blob for session state"""
+    return orjson.dumps(itinerary) if orjson else json.dumps(itinerary).encode('utf-8')
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def decode_itinerary(blob):
+    """Deserialize an itinerary blob (shared across reruns, treat as read-only)"""
+    return orjson.loads(blob) if orjson else json.loads(blob)
+
+@st.cache_resource(show_spinner=False)
+def pdf_styles():
+    """Import reportlab and build the PDF styles shared by every generated guide"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    
+    sheet = getSampleStyleSheet()
+    
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=sheet['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#4F46E5'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=sheet['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1F2937'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    overview_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F46E5')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    
+    value_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F0FDF4')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#22C55E')),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('PADDING', (0, 0), (-1, -1), 8)
+    ])
     
-    return itinerary_days
+    activity_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F46E5')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('PADDING', (0, 0), (-1, -1), 6)
+    ])
+    
+    return {
+        'sheet': sheet,
+        'title': title_style,
+        'heading': heading_style,
+        'overview_table': overview_table_style,
+        'value_table': value_table_style,
+        'activity_table': activity_table_style
+    }
 
-def generate_pdf(destination, departure, start_date, days, itinerary, weather_data, value_score, interests, guardrails):
-    """Generate comprehensive PDF travel guide"""
-    try:
-        if not PDF_AVAILABLE:
-            raise ImportError("ReportLab not installed")
-        
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
-        story = []
-        styles = getSampleStyleSheet()
+@st.cache_data(max_entries=8, show_spinner=False)
+def generate_pdf(destination, departure, start_date, days, itinerary_blob, totals, weather_array, value_score, _interests, _guardrails):
+    """Generate comprehensive PDF travel guide as bytes (cached until the inputs change)"""
+    if not PDF_AVAILABLE:
+        raise ImportError("ReportLab not installed")
+    
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, PageBreak
+    
+    styles = pdf_styles()
+    itinerary = decode_itinerary(itinerary_blob)
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    story = []
+    
+    # Cover Page
+    story.append(Spacer(1, 2*inch))
+    story.append(Paragraph(f"Your Travel Guide to {destination}", styles['title']))
+    story.append(Paragraph(f"{days}-Day Personalized Itinerary", styles['sheet']['Normal']))
+    story.append(Spacer(1, 0.5*inch))
+    story.append(Paragraph(f"Departing from: {departure}", styles['sheet']['Normal']))
+    story.append(Paragraph(f"Travel Dates: {start_date}", styles['sheet']['Normal']))
+    story.append(PageBreak())
+    
+    # Trip Overview
+    story.append(Paragraph("Trip Overview", styles['heading']))
+    overview_data = [
+        ['Destination', destination],
+        ['Duration', f'{days} days'],
+        ['Departure', departure],
+        ['Budget Level', f"${value_score['avg_daily_cost']}/day"],
+        ['Total Activities', str(totals['total_activities'])],
+        ['Estimated Total Cost', f"${totals['total_cost']}"]
+    ]
+    overview_table = Table(overview_data, colWidths=[2.5*inch, 3.5*inch])
+    overview_table.setStyle(styles['overview_table'])
+    story.append(overview_table)
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Weather Forecast Summary
+    story.append(Paragraph("14-Day Weather Forecast", styles['heading']))
+    avg_temp = int(weather_array.temp[:14].sum()) // 14
+    rainy_days = int((weather_array.cond[:14] == RAINY).sum())
+    weather_summary = f"Average Temperature: {avg_temp} F | Rainy Days: {rainy_days}"
+    story.append(Paragraph(weather_summary, styles['sheet']['Normal']))
+    story.append(Spacer(1, 0.3*inch))
+    
+    # Value Score
+    story.append(Paragraph("Value Score Analysis", styles['heading']))
+    value_data = [
+        ['Overall Value', f"{value_score['overall']}/10"],
+        ['Cost of Living', f"{value_score['cost_of_living']}/10"],
+        ['Exchange Rate', f"{value_score['exchange_rate']}/10"],
+        ['Est. Daily Cost', f"${value_score['avg_daily_cost']}"]
+    ]
+    value_table = Table(value_data, colWidths=[3*inch, 3*inch])
+    value_table.setStyle(styles['value_table'])
+    story.append(value_table)
+    story.append(PageBreak())
+    
+    # Daily Itinerary
+    story.append(Paragraph("Detailed Daily Itinerary", styles['heading']))
+    
+    def day_flowables(day):
+        """Yield the PDF flowables for a single itinerary day"""
+        yield Paragraph(f"Day {day['day']}: {day['theme']}", styles['heading'])
+        yield Paragraph(f"Walking Distance: {day['walking_distance']} | Daily Cost: ${day['total_cost']}", styles['sheet']['Italic'])
+        yield Spacer(1, 0.1*inch)
         
-        # Custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#4F46E5'),
-            spaceAfter=30,
-            alignment=TA_CENTER
+        # Activities table
+        activity_data = [['Time', 'Activity', 'Cost']]
+        activity_data.extend(
+            [
+                act['time'],
+                f"{act['title']}\n{act['description']}",
+                f"${act['cost']}" if act['cost'] > 0 else "Free"
+            ]
+            for act in day['activities']
         )
         
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#1F2937'),
-            spaceAfter=12,
-            spaceBefore=12
+        activity_table = Table(activity_data, colWidths=[1.5*inch, 3.5*inch, 1*inch])
+        activity_table.setStyle(styles['activity_table'])
+        yield activity_table
+        yield Spacer(1, 0.3*inch)
+    
+    for day in iter_itinerary_days(itinerary):
+        story.extend(day_flowables(day))
+    
+    # Packing List
+    story.append(PageBreak())
+    story.append(Paragraph("Packing List", styles['heading']))
+    packing_items = [
+        "Passport & Travel Documents",
+        "Travel Insurance Information",
+        "Credit Cards & Cash",
+        "Phone Charger & Power Adapter",
+        "Comfortable Walking Shoes",
+        "Weather-appropriate Clothing",
+        "Sunscreen & Sunglasses",
+        "Camera & Accessories",
+        "Medications & First Aid",
+        "Reusable Water Bottle"
+    ]
+    for item in packing_items:
+        story.append(Paragraph(f"☐ {item}", styles['sheet']['Normal']))
+        story.append(Spacer(1, 0.05*inch))
+    
+    # Build PDF
+    doc.build(story)
+    return buffer.getvalue()
+
+def render_activity(activity):
+    """Render an activity as a bordered card built from native Streamlit elements"""
+    with st.container(border=True):
+        info_col, cost_col = st.columns([4, 1])
+        info_col.markdown(f"**{activity['time']} • {activity['type'].upper()}**")
+        info_col.write(activity['title'])
+        info_col.caption(activity['description'])
+        info_col.caption(f"Energy Level: {activity['energy'].title()}")
+        cost_col.metric(
+            "Cost", 'FREE' if activity['cost'] == 0 else f"${activity['cost']}",
+            label_visibility="collapsed"
         )
-        
-        # Cover Page
-        story.append(Spacer(1, 2*inch))
-        story.append(Paragraph(f"Your Travel Guide to {destination}", title_style))
-        story.append(Paragraph(f"{days}-Day Personalized Itinerary", styles['Normal']))
-        story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph(f"Departing from: {departure}", styles['Normal']))
-        story.append(Paragraph(f"Travel Dates: {start_date}", styles['Normal']))
-        story.append(PageBreak())
-        
-        # Trip Overview
-        story.append(Paragraph("Trip Overview", heading_style))
-        overview_data = [
-            ['Destination', destination],
-            ['Duration', f'{days} days'],
-            ['Departure', departure],
-            ['Budget Level', f"${value_score['avg_daily_cost']}/day"],
-            ['Total Activities', str(sum(len(day['activities']) for day in itinerary))],
-            ['Estimated Total Cost', f"${sum(day['total_cost'] for day in itinerary)}"]
-        ]
-        overview_table = Table(overview_data, colWidths=[2.5*inch, 3.5*inch])
-        overview_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F46E5')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(overview_table)
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Weather Forecast Summary
-        story.append(Paragraph("14-Day Weather Forecast", heading_style))
-        avg_temp = sum(w['temp'] for w in weather_data[:14])//14
-        rainy_days = sum(1 for w in weather_data[:14] if w['condition'] == 'rainy')
-        weather_summary = f"Average Temperature: {avg_temp} F | Rainy Days: {rainy_days}"
-        story.append(Paragraph(weather_summary, styles['Normal']))
-        story.append(Spacer(1, 0.3*inch))
-        
-        # Value Score
-        story.append(Paragraph("Value Score Analysis", heading_style))
-        value_data = [
-            ['Overall Value', f"{value_score['overall']}/10"],
-            ['Cost of Living', f"{value_score['cost_of_living']}/10"],
-            ['Exchange Rate', f"{value_score['exchange_rate']}/10"],
-            ['Est. Daily Cost', f"${value_score['avg_daily_cost']}"]
-        ]
-        value_table = Table(value_data, colWidths=[3*inch, 3*inch])
-        value_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F0FDF4')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#22C55E')),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('PADDING', (0, 0), (-1, -1), 8)
-        ]))
-        story.append(value_table)
-        story.append(PageBreak())
-        
-        # Daily Itinerary
-        story.append(Paragraph("Detailed Daily Itinerary", heading_style))
-        
-        for day in itinerary:
-            story.append(Paragraph(f"Day {day['day']}: {day['theme']}", heading_style))
-            story.append(Paragraph(f"Walking Distance: {day['walking_distance']} | Daily Cost: ${day['total_cost']}", styles['Italic']))
-            story.append(Spacer(1, 0.1*inch))
-            
-            # Activities table
-            activity_data = [['Time', 'Activity', 'Cost']]
-            for act in day['activities']:
-                activity_data.append([
-                    act['time'],
-                    f"{act['title']}\n{act['description']}",
-                    f"${act['cost']}" if act['cost'] > 0 else "Free"
-                ])
-            
-            activity_table = Table(activity_data, colWidths=[1.5*inch, 3.5*inch, 1*inch])
-            activity_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4F46E5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F9FAFB')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('PADDING', (0, 0), (-1, -1), 6)
-            ]))
-            story.append(activity_table)
-            story.append(Spacer(1, 0.3*inch))
-        
-        # Packing List
-        story.append(PageBreak())
-        story.append(Paragraph("Packing List", heading_style))
-        packing_items = [
-            "Passport & Travel Documents",
-            "Travel Insurance Information",
-            "Credit Cards & Cash",
-            "Phone Charger & Power Adapter",
-            "Comfortable Walking Shoes",
-            "Weather-appropriate Clothing",
-            "Sunscreen & Sunglasses",
-            "Camera & Accessories",
-            "Medications & First Aid",
-            "Reusable Water Bottle"
-        ]
-        for item in packing_items:
-            story.append(Paragraph(f"☐ {item}", styles['Normal']))
-            story.append(Spacer(1, 0.05*inch))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-        
-    except Exception as e:
-        st.session_state.pdf_error = str(e)
-        st.error(f"PDF Generation Error: {str(e)}")
-        st.error(f"Full traceback: {traceback.format_exc()}")
-        return None
 
 # Header
 st.markdown('<div class="main-header">✈️ Travel Guide AI</div>', unsafe_allow_html=True)
@@ -510,26 +647,24 @@ with st.container():
         st.info(f"💡 End date is automatically calculated as {days} days from start date")
         
     st.markdown("### 🎯 Select Your Interests")
-    interest_cols = st.columns(4)
-    selected_interests = []
-    
-    for idx, (label, value) in enumerate(INTERESTS.items()):
-        with interest_cols[idx % 4]:
-            if st.checkbox(label, key=f"interest_{value}_{st.session_state.form_key}"):
-                selected_interests.append(value)
+    selected_labels = st.multiselect(
+        "Interests", list(INTERESTS),
+        label_visibility="collapsed",
+        placeholder="Choose one or more interests",
+        key=f"interests_{st.session_state.form_key}"
+    )
+    selected_interests = [INTERESTS[label] for label in selected_labels]
     
     # Guardrails
     with st.expander("🛡️ Guardrails & Accessibility Options"):
         guardrail_selections = []
         
         for category, options in GUARDRAILS.items():
-            st.markdown(f"**{category}**")
-            cols = st.columns(3)
-            for idx, option in enumerate(options):
-                with cols[idx % 3]:
-                    label = option.replace('_', ' ').title()
-                    if st.checkbox(label, key=f"guard_{option}_{st.session_state.form_key}"):
-                        guardrail_selections.append(option)
+            guardrail_selections.extend(st.multiselect(
+                f"**{category}**", options,
+                format_func=lambda option: option.replace('_', ' ').title(),
+                key=f"guard_{category}_{st.session_state.form_key}"
+            ))
 
 # Action Buttons
 col1, col2, col3 = st.columns([3, 1, 1])
@@ -541,22 +676,28 @@ with col1:
         else:
             with st.spinner("Generating your perfect trip... ✨"):
                 # Generate data
-                st.session_state.weather_data = generate_weather_forecast(14)
-                st.session_state.value_score = calculate_value_score(destination, budget)
-                st.session_state.itinerary = generate_itinerary(
+                seed = trip_seed(destination, start_date)
+                st.session_state.weather_data, st.session_state.weather_array = generate_weather_forecast(14, seed)
+                st.session_state.value_score = calculate_value_score(destination, budget, seed)
+                itinerary, st.session_state.itinerary_totals = generate_itinerary(
                     destination, days, selected_interests, 
-                    guardrail_selections, budget
+                    guardrail_selections, budget, seed
                 )
+                st.session_state.itinerary_blob = encode_itinerary(itinerary)
                 st.session_state.pdf_error = None
+                st.session_state.pdf_bytes = None
                 st.success("✅ Itinerary generated successfully!")
                 st.rerun()
 
 with col2:
     if st.button("🔄 Reset Form", use_container_width=True):
-        st.session_state.itinerary = None
+        st.session_state.itinerary_blob = None
+        st.session_state.itinerary_totals = None
         st.session_state.weather_data = None
+        st.session_state.weather_array = None
         st.session_state.value_score = None
         st.session_state.pdf_error = None
+        st.session_state.pdf_bytes = None
         st.session_state.form_key += 1  # Increment to reset all form fields
         st.rerun()
 
@@ -566,18 +707,16 @@ if st.session_state.weather_data and st.session_state.value_score:
     
     # Weather Forecast
     st.markdown("### 🌤️ 14-Day Weather Forecast")
-    weather_cols = st.columns(7)
-    for idx, day in enumerate(st.session_state.weather_data[:14]):
-        with weather_cols[idx % 7]:
-            icon = {'sunny': '☀️', 'partly_cloudy': '⛅', 'cloudy': '☁️', 'rainy': '🌧️'}[day['condition']]
-            st.markdown(f"""
-            <div class="weather-box">
-                <div style="font-size: 2rem;">{icon}</div>
-                <div><strong>Day {day['day']}</strong></div>
-                <div style="font-size: 1.5rem;">{day['temp']}°F</div>
-                <div style="font-size: 0.8rem;">{day['precipitation']}% rain</div>
-            </div>
-            """, unsafe_allow_html=True)
+    weather_cards = ''.join(
+        f'<div class="weather-box">'
+        f'<div style="font-size: 2rem;">{WEATHER_ICONS[day["condition"]]}</div>'
+        f'<div><strong>Day {day["day"]}</strong></div>'
+        f'<div style="font-size: 1.5rem;">{day["temp"]}°F</div>'
+        f'<div style="font-size: 0.8rem;">{day["precipitation"]}% rain</div>'
+        f'</div>'
+        for day in st.session_state.weather_data[:14]
+    )
+    st.markdown(f'<div class="weather-grid">{weather_cards}</div>', unsafe_allow_html=True)
     
     st.markdown("")
     
@@ -602,74 +741,60 @@ if st.session_state.weather_data and st.session_state.value_score:
             """, unsafe_allow_html=True)
 
 # Display Itinerary
-if st.session_state.itinerary:
+if st.session_state.itinerary_blob:
+    itinerary = decode_itinerary(st.session_state.itinerary_blob)
     st.markdown("---")
     st.markdown(f"### 🗺️ Your {days}-Day Itinerary")
     
-    # Download PDF button
+    # Download PDF button (the PDF is only built once the user asks for it)
     if PDF_AVAILABLE:
-        try:
-            pdf_buffer = generate_pdf(
-                destination, departure, str(start_date), days,
-                st.session_state.itinerary, st.session_state.weather_data,
-                st.session_state.value_score, selected_interests, guardrail_selections
+        # The PDF content depends on these inputs; the rest only change with a new itinerary
+        pdf_inputs = (destination, departure, str(start_date), days, st.session_state.itinerary_blob)
+        if st.session_state.pdf_inputs != pdf_inputs:
+            st.session_state.pdf_bytes = None
+        
+        if st.button("📄 Prepare PDF Guide"):
+            try:
+                with st.spinner("Building your PDF guide..."):
+                    st.session_state.pdf_bytes = generate_pdf(
+                        destination, departure, str(start_date), days,
+                        st.session_state.itinerary_blob, st.session_state.itinerary_totals,
+                        st.session_state.weather_array,
+                        st.session_state.value_score, selected_interests, guardrail_selections
+                    )
+                    st.session_state.pdf_inputs = pdf_inputs
+            except Exception as e:
+                st.session_state.pdf_bytes = None
+                st.session_state.pdf_error = str(e)
+                st.error(f"❌ PDF Error: {str(e)}")
+                st.code(traceback.format_exc())
+        
+        if st.session_state.pdf_bytes:
+            st.download_button(
+                label="📥 Download Complete PDF Guide",
+                data=st.session_state.pdf_bytes,
+                file_name=f"travel_guide_{destination.replace(' ', '_').lower()}.pdf",
+                mime="application/pdf",
+                type="primary",
+                use_container_width=False
             )
-            
-            if pdf_buffer:
-                st.download_button(
-                    label="📥 Download Complete PDF Guide",
-                    data=pdf_buffer,
-                    file_name=f"travel_guide_{destination.replace(' ', '_').lower()}.pdf",
-                    mime="application/pdf",
-                    type="primary",
-                    use_container_width=False
-                )
-                st.success("✅ PDF ready for download!")
-            else:
-                st.error("❌ PDF generation failed. Check error messages above.")
-        except Exception as e:
-            st.error(f"❌ PDF Error: {str(e)}")
-            st.code(traceback.format_exc())
+            st.success("✅ PDF ready for download!")
     else:
         st.info("💡 Install reportlab to enable PDF download: `pip install reportlab`")
     
     st.markdown("")
     
     # Display each day
-    for day in st.session_state.itinerary:
+    for day in iter_itinerary_days(itinerary):
         with st.expander(f"**Day {day['day']}: {day['theme']}** - ${day['total_cost']} | {day['walking_distance']}", expanded=day['day']==1):
             for activity in day['activities']:
-                st.markdown(f"""
-                <div class="activity-card">
-                    <div style="display: flex; justify-content: space-between; align-items: start;">
-                        <div style="flex: 1;">
-                            <div style="color: #4F46E5; font-weight: bold; margin-bottom: 0.5rem;">
-                                {activity['time']} • {activity['type'].upper()}
-                            </div>
-                            <div style="font-size: 1.1rem; font-weight: bold; margin-bottom: 0.3rem;">
-                                {activity['title']}
-                            </div>
-                            <div style="color: #6B7280;">
-                                {activity['description']}
-                            </div>
-                            <div style="margin-top: 0.5rem; font-size: 0.9rem; color: #9CA3AF;">
-                                Energy Level: {activity['energy'].title()}
-                            </div>
-                        </div>
-                        <div style="text-align: right; margin-left: 1rem;">
-                            <div style="font-size: 1.5rem; font-weight: bold; color: #1F2937;">
-                                {'FREE' if activity['cost'] == 0 else f"${activity['cost']}"}
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                render_activity(activity)
     
     # Trip Summary
     st.markdown("### 📊 Trip Summary")
     summary_cols = st.columns(4)
-    total_cost = sum(day['total_cost'] for day in st.session_state.itinerary)
-    total_activities = sum(len(day['activities']) for day in st.session_state.itinerary)
+    total_cost = st.session_state.itinerary_totals['total_cost']
+    total_activities = st.session_state.itinerary_totals['total_activities']
     
     summary_cols[0].metric("Total Days", days)
     summary_cols[1].metric("Total Cost", f"${total_cost}")